@@ -0,0 +1,55 @@
+"""
+Optional Numba kernel for batch score fusion of uploaded CSVs.
+
+fuse_scores(touch, typing, usage) -> (final_score float64[N], risk_level str[N])
+
+fuse_scores is None when numba is not installed; callers keep their NumPy
+path in that case. Weights, evaluation order and thresholds match
+calculate_final_score and determine_risk_level in app.py, in float64, so
+labels agree with the slider path bit for bit.
+"""
+import numpy as np
+
+RISK_LEVELS = np.array(['LOW', 'MEDIUM', 'HIGH'])
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _fuse_scores(touch, typing, usage):
+    n = touch.shape[0]
+    final = np.empty(n, dtype=np.float64)
+    risk = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        f = 0.5 * touch[i] + 0.3 * typing[i] + 0.2 * usage[i]
+        final[i] = f
+        if f <= 0.4:
+            risk[i] = 0
+        elif f <= 0.7:
+            risk[i] = 1
+        else:
+            risk[i] = 2
+    return final, risk
+
+
+if njit is not None:
+    # parallel=True is avoided on purpose: Streamlit runs the script on a
+    # worker thread and Numba's workqueue pool then blocks interpreter exit.
+    _fuse_scores_njit = njit(cache=True)(_fuse_scores)
+
+    # Compile at import so the first upload doesn't pay the JIT cost
+    _warm = np.zeros(2, dtype=np.float64)
+    _fuse_scores_njit(_warm, _warm, _warm)
+    del _warm
+
+    def fuse_scores(touch, typing, usage):
+        final, risk = _fuse_scores_njit(
+            np.ascontiguousarray(touch, dtype=np.float64),
+            np.ascontiguousarray(typing, dtype=np.float64),
+            np.ascontiguousarray(usage, dtype=np.float64),
+        )
+        return final, RISK_LEVELS[risk]
+else:
+    fuse_scores = None
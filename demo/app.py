@@ -1,14 +1,17 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import time
 import io
 from datetime import datetime, timedelta
-import base64
-import tempfile
-from fpdf import FPDF
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+
+# matplotlib, plotly and fpdf are imported where they are used, so the first
+# render doesn't pay for libraries the session may never need
+
+from _fuse_kernel import RISK_LEVELS, fuse_scores
 
 
 # Configure the page
@@ -131,13 +134,29 @@ def init_session_state():
         st.session_state.typing_score = 0.5
     if 'usage_score' not in st.session_state:
         st.session_state.usage_score = 0.5
+    if 'history_cap' not in st.session_state:
+        st.session_state.history_cap = 1000
     if 'score_history' not in st.session_state:
-        st.session_state.score_history = []
+        st.session_state.score_history = deque(maxlen=st.session_state.history_cap)
+        # Rows ever added; lets caches tell new rows apart once the deque is full
+        st.session_state.history_total = 0
     if 'theme' not in st.session_state:
         st.session_state.theme = "light"
 
 init_session_state()
 
+# Upper bounds (inclusive) of the LOW and MEDIUM risk bands, for batch scoring
+RISK_BINS = np.array([0.4, 0.7])
+
+# Columns passed to create_trend_chart; history rows are flattened to tuples so
+# the chart can be cached on its inputs
+TREND_COLUMNS = ('timestamp', 'touch_score', 'typing_score', 'usage_score', 'final_score')
+HISTORY_COLUMNS = TREND_COLUMNS + ('risk_level',)
+
+# Radar chart axes; the last angle closes the polygon back to the first
+RADAR_CATEGORIES = ('Touch Score', 'Typing Score', 'Usage Score', 'Fusion Score')
+RADAR_ANGLES = np.linspace(0, 2*np.pi, len(RADAR_CATEGORIES) + 1).tolist()
+
 # Utility functions
 def calculate_final_score(touch_score, typing_score, usage_score):
     # Updated weights for 3-agent fusion: touch=0.5, typing=0.3, usage=0.2
@@ -151,6 +170,16 @@ def determine_risk_level(score):
     else:
         return "HIGH", "high-risk"
 
+@lru_cache(maxsize=2048)
+def _score_and_risk(touch_score, typing_score, usage_score):
+    final_score = calculate_final_score(touch_score, typing_score, usage_score)
+    risk_level, risk_class = determine_risk_level(final_score)
+    return final_score, risk_level, risk_class
+
+def score_and_risk(touch_score, typing_score, usage_score):
+    # Sliders move in 0.01 steps, so rounding keeps the cache small and hot
+    return _score_and_risk(round(touch_score, 2), round(typing_score, 2), round(usage_score, 2))
+
 def get_touch_explanation(score):
     if score < 0.3:
         return "❌ Significant touch behavior anomalies detected. Unusual swipe patterns, tap pressure, or gesture velocity observed."
@@ -175,55 +204,78 @@ def get_usage_explanation(score):
     else:
         return "✅ Normal usage patterns. Consistent with user's historical behavior."
 
+def add_to_history(rows):
+    st.session_state.score_history.extend(rows)
+    st.session_state.history_total += len(rows)
+
+def history_tail(n):
+    # Last n history rows as a list (deques can't be sliced)
+    history = st.session_state.score_history
+    return list(islice(history, len(history) - n, None))
+
 def generate_random_data():
     st.session_state.touch_score = round(np.random.uniform(0, 1), 2)
     st.session_state.typing_score = round(np.random.uniform(0, 1), 2)
     st.session_state.usage_score = round(np.random.uniform(0, 1), 2)
     # Add to history
-    final_score = calculate_final_score(
+    final_score, risk_level, _ = score_and_risk(
         st.session_state.touch_score,
-        st.session_state.typing_score, 
+        st.session_state.typing_score,
         st.session_state.usage_score
     )
-    risk_level, _ = determine_risk_level(final_score)
     timestamp = datetime.now()
-    st.session_state.score_history.append({
+    add_to_history([{
         'timestamp': timestamp,
         'touch_score': st.session_state.touch_score,
         'typing_score': st.session_state.typing_score,
         'usage_score': st.session_state.usage_score,
         'final_score': final_score,
         'risk_level': risk_level
-    })
+    }])
 
-def create_radar_chart(touch_score, typing_score, usage_score, final_score):
-    categories = ['Touch Score', 'Typing Score', 'Usage Score', 'Fusion Score']
-    values = [touch_score, typing_score, usage_score, final_score]
-    
+def fig_to_png(fig):
+    # Cached charts are stored as PNG bytes rather than pickled Figures
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=90, bbox_inches='tight')
+    return buf.getvalue()
+
+def chart_figure(name, **kwargs):
+    # One persistent figure per chart and session, redrawn in place on cache misses
+    key = f'_{name}_fig'
+    if key not in st.session_state:
+        import matplotlib.pyplot as plt
+        st.session_state[key] = plt.subplots(**kwargs)
+    return st.session_state[key]
+
+@st.cache_data(max_entries=64)
+def create_radar_chart(_figure, touch_score, typing_score, usage_score, final_score):
     # Complete the circle for radar chart
-    values += values[:1]
-    categories += categories[:1]
+    values = np.empty(len(RADAR_ANGLES))
+    values[:-1] = (touch_score, typing_score, usage_score, final_score)
+    values[-1] = values[0]
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
+    # Reuse figure
+    fig, ax = _figure
+    ax.clear()
     
     # Draw the chart
-    angles = np.linspace(0, 2*np.pi, len(categories)).tolist()
-    ax.plot(angles, values, color='#1f77b4', linewidth=2)
-    ax.fill(angles, values, color='#1f77b4', alpha=0.25)
+    ax.plot(RADAR_ANGLES, values, color='#1f77b4', linewidth=2)
+    ax.fill(RADAR_ANGLES, values, color='#1f77b4', alpha=0.25)
     
     # Set labels
     ax.set_yticklabels([])
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(categories[:-1])
+    ax.set_xticks(RADAR_ANGLES[:-1])
+    ax.set_xticklabels(RADAR_CATEGORIES)
     
     # Set title
-    plt.title('Fraud Risk Assessment', size=14, color='#1f77b4', y=1.1)
+    ax.set_title('Fraud Risk Assessment', size=14, color='#1f77b4', y=1.1)
     
-    return fig
+    return fig_to_png(fig)
 
-def create_gauge_chart(final_score):
-    fig, ax = plt.subplots(figsize=(10, 4))
+@st.cache_data(max_entries=64)
+def create_gauge_chart(_figure, final_score):
+    fig, ax = _figure
+    ax.clear()
     
     # Create gradient background for gauge
     gradient = np.linspace(0, 1, 100).reshape(1, -1)
@@ -245,48 +297,85 @@ def create_gauge_chart(final_score):
     ax.set_xlim(0, 1)
     ax.set_xlabel('Risk Score')
     
-    return fig
+    return fig_to_png(fig)
 
-def create_trend_chart(history):
-    if not history:
+def trend_rows(history):
+    return tuple(tuple(r[c] for c in TREND_COLUMNS) for r in history)
+
+@st.cache_data(max_entries=64)
+def create_trend_chart(rows):
+    if not rows:
         return None
         
-    df = pd.DataFrame(history)
+    df = pd.DataFrame(list(rows), columns=TREND_COLUMNS)
     df.set_index('timestamp', inplace=True)
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(df.index, df['touch_score'], label='Touch Score', marker='o')
-    ax.plot(df.index, df['typing_score'], label='Typing Score', marker='d')
-    ax.plot(df.index, df['usage_score'], label='Usage Score', marker='s')
-    ax.plot(df.index, df['final_score'], label='Fusion Score', marker='^', linewidth=2)
+    import plotly.graph_objects as go
     
-    ax.axhline(y=0.4, color='green', linestyle='--', alpha=0.7, label='Low Risk Threshold')
-    ax.axhline(y=0.7, color='orange', linestyle='--', alpha=0.7, label='Medium Risk Threshold')
+    # WebGL traces are drawn in the browser, so long histories stay cheap here
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=df.index, y=df['touch_score'], name='Touch Score', mode='lines+markers', marker_symbol='circle'))
+    fig.add_trace(go.Scattergl(x=df.index, y=df['typing_score'], name='Typing Score', mode='lines+markers', marker_symbol='diamond'))
+    fig.add_trace(go.Scattergl(x=df.index, y=df['usage_score'], name='Usage Score', mode='lines+markers', marker_symbol='square'))
+    fig.add_trace(go.Scattergl(x=df.index, y=df['final_score'], name='Fusion Score', mode='lines+markers', marker_symbol='triangle-up', line_width=3))
     
-    ax.set_ylim(0, 1)
-    ax.set_ylabel('Score')
-    ax.set_xlabel('Time')
-    ax.set_title('Score Trends Over Time')
-    ax.legend()
-    ax.grid(True, alpha=0.3)
+    fig.add_hline(y=0.4, line_color='green', line_dash='dash', opacity=0.7, annotation_text='Low Risk Threshold')
+    fig.add_hline(y=0.7, line_color='orange', line_dash='dash', opacity=0.7, annotation_text='Medium Risk Threshold')
     
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    fig.update_layout(
+        title='Score Trends Over Time',
+        xaxis_title='Time',
+        yaxis_title='Score',
+        yaxis_range=[0, 1],
+        xaxis_tickangle=45
+    )
     
     return fig
 
+def history_df():
+    # Keep a per-session frame and build just the rows added since the last
+    # rerun, dropping the ones the bounded deque has evicted
+    history = st.session_state.score_history
+    total = st.session_state.history_total
+    df, df_total = st.session_state.get('_history_df', (None, 0))
+    new = total - df_total
+    if df is None or new > len(history):
+        df = pd.DataFrame(list(history), columns=list(HISTORY_COLUMNS))
+    elif new:
+        new_rows = pd.DataFrame(history_tail(new), columns=list(HISTORY_COLUMNS))
+        df = pd.concat([df, new_rows], ignore_index=True) if len(df) else new_rows
+    if len(df) > len(history):
+        df = df.iloc[len(df) - len(history):].reset_index(drop=True)
+    st.session_state._history_df = (df, total)
+    return df
+
 def generate_csv():
-    if st.session_state.score_history:
-        df = pd.DataFrame(st.session_state.score_history)
-        return df.to_csv(index=False)
-    return None
+    # The export button evaluates this on every rerun, so serialize just the
+    # rows added since the last call. Once rows have been evicted from the
+    # front of the history the buffer is rebuilt (bounded by history_cap).
+    history = st.session_state.score_history
+    if not history:
+        return None
+    total = st.session_state.history_total
+    first = total - len(history)
+    buf, buf_first, written = st.session_state.get('_csv_buf', (None, 0, 0))
+    if buf is None or buf_first != first:
+        buf = io.StringIO()
+        history_df().to_csv(buf, index=False)
+    elif written < total:
+        new_rows = pd.DataFrame(history_tail(total - written), columns=list(HISTORY_COLUMNS))
+        new_rows.to_csv(buf, header=False, index=False)
+    st.session_state._csv_buf = (buf, first, total)
+    return buf.getvalue()
 
 def generate_pdf_report(touch_score, typing_score, usage_score, final_score, risk_level):
+    from fpdf import FPDF
+    
     pdf = FPDF()
     pdf.add_page()
     
     # Add Unicode font from your fonts folder
-    pdf.add_font('DejaVu', '', 'fonts/DejaVuSans.ttf', uni=True)
+    pdf.add_font('DejaVu', '', 'fonts/DejaVuSans.ttf')
     
     # Title
     pdf.set_font('DejaVu', '', 16)
@@ -317,13 +406,13 @@ def generate_pdf_report(touch_score, typing_score, usage_score, final_score, ris
     pdf.multi_cell(0, 10, f"Typing Analysis: {get_typing_explanation(typing_score)}")
     pdf.multi_cell(0, 10, f"Usage Analysis: {get_usage_explanation(usage_score)}")
     
-    # Save to temporary file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    pdf.output(temp_file.name)
-    return temp_file.name
+    # Render in memory; fpdf2 returns a bytearray
+    return bytes(pdf.output())
 
 def process_uploaded_file(uploaded_file):
     try:
+        # Scores stay float64: they go into the history table and CSV export as
+        # uploaded, and the risk bands must match determine_risk_level
         df = pd.read_csv(uploaded_file)
         # Simple validation
         required_cols = ['timestamp', 'touch_score', 'typing_score', 'usage_score']
@@ -332,10 +421,19 @@ def process_uploaded_file(uploaded_file):
             return None
             
         # Calculate final scores and risk levels
-        df['final_score'] = 0.5 * df['touch_score'] + 0.3 * df['typing_score'] + 0.2 * df['usage_score']
-        df['risk_level'] = df['final_score'].apply(
-            lambda x: 'LOW' if x <= 0.4 else 'MEDIUM' if x <= 0.7 else 'HIGH'
-        )
+        if fuse_scores is not None:
+            df['final_score'], df['risk_level'] = fuse_scores(
+                df['touch_score'].to_numpy(), df['typing_score'].to_numpy(), df['usage_score'].to_numpy()
+            )
+        else:
+            # Same expression as the slider path, so labels agree exactly
+            scores = calculate_final_score(
+                df['touch_score'].to_numpy(dtype=np.float64),
+                df['typing_score'].to_numpy(dtype=np.float64),
+                df['usage_score'].to_numpy(dtype=np.float64),
+            )
+            df['final_score'] = scores
+            df['risk_level'] = RISK_LEVELS[np.digitize(scores, RISK_BINS, right=True)]
         
         return df
     except Exception as e:
@@ -357,6 +455,19 @@ with st.sidebar:
         help="Choose light or dark theme"
     )
     
+    # History size
+    history_cap = st.number_input(
+        "History Size",
+        min_value=10,
+        max_value=100000,
+        value=st.session_state.history_cap,
+        step=100,
+        help="Maximum number of assessments kept; the oldest are dropped first"
+    )
+    if history_cap != st.session_state.history_cap:
+        st.session_state.history_cap = history_cap
+        st.session_state.score_history = deque(st.session_state.score_history, maxlen=history_cap)
+    
     # Random data button
     if st.button("🎲 Simulate Random User Data", use_container_width=True):
         generate_random_data()
@@ -376,15 +487,7 @@ with st.sidebar:
             st.dataframe(processed_data.head(), use_container_width=True)
             
             # Add to history
-            for _, row in processed_data.iterrows():
-                st.session_state.score_history.append({
-                    'timestamp': row['timestamp'],
-                    'touch_score': row['touch_score'],
-                    'typing_score': row['typing_score'],
-                    'usage_score': row['usage_score'],
-                    'final_score': row['final_score'],
-                    'risk_level': row['risk_level']
-                })
+            add_to_history(processed_data[list(HISTORY_COLUMNS)].to_dict('records'))
     
     # Export options
     st.header("Export Results")
@@ -403,14 +506,13 @@ with st.sidebar:
     
     with col2:
         if st.button("📊 Generate PDF Report", use_container_width=True):
-            final_score = calculate_final_score(
+            final_score, risk_level, _ = score_and_risk(
                 st.session_state.touch_score,
-                st.session_state.typing_score, 
+                st.session_state.typing_score,
                 st.session_state.usage_score
             )
-            risk_level, _ = determine_risk_level(final_score)
             
-            pdf_path = generate_pdf_report(
+            pdf_data = generate_pdf_report(
                 st.session_state.touch_score,
                 st.session_state.typing_score,
                 st.session_state.usage_score,
@@ -418,9 +520,6 @@ with st.sidebar:
                 risk_level
             )
             
-            with open(pdf_path, "rb") as f:
-                pdf_data = f.read()
-            
             st.download_button(
                 label="⬇️ Download PDF",
                 data=pdf_data,
@@ -429,178 +528,181 @@ with st.sidebar:
                 use_container_width=True
             )
 
-# Create two columns for the layout
-col1, col2 = st.columns([1, 1])
+# Dashboard body. Slider changes rerun only this fragment, not the sidebar's
+# upload processing and export code above.
+@st.fragment
+def render_dashboard():
+    # Create two columns for the layout
+    col1, col2 = st.columns([1, 1])
 
-with col1:
-    st.markdown("### Configuration Panel")
-    
-    # Sliders for scores
-    st.markdown('<div class="slider-container">', unsafe_allow_html=True)
-    
-    # Touch score slider with unique key
-    touch_score = st.slider(
-        "Touch Behavior Score", 
-        min_value=0.0, 
-        max_value=1.0, 
-        value=st.session_state.touch_score,
-        step=0.01,
-        key="main_touch_score_slider",
-        help="Measure of how typical the user's touch patterns are (0 = anomalous, 1 = normal)"
-    )
-    st.session_state.touch_score = touch_score
-    
-    # Typing score slider with unique key
-    typing_score = st.slider(
-        "Typing Behavior Score", 
-        min_value=0.0, 
-        max_value=1.0, 
-        value=st.session_state.typing_score,
-        step=0.01,
-        key="main_typing_score_slider",
-        help="Measure of how typical the user's keystroke dynamics are (0 = anomalous, 1 = normal)"
-    )
-    st.session_state.typing_score = typing_score
-    
-    # Usage score slider with unique key
-    usage_score = st.slider(
-        "Usage Pattern Score", 
-        min_value=0.0, 
-        max_value=1.0, 
-        value=st.session_state.usage_score,
-        step=0.01,
-        key="main_usage_score_slider",
-        help="Measure of how typical the user's app usage patterns are (0 = anomalous, 1 = normal)"
-    )
-    st.session_state.usage_score = usage_score
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Calculate final score
-    final_score = calculate_final_score(
-        st.session_state.touch_score,
-        st.session_state.typing_score, 
-        st.session_state.usage_score
-    )
-    
-    # Determine risk level
-    risk_level, risk_class = determine_risk_level(final_score)
-    
-    # Display metrics
-    col1_1, col1_2, col1_3, col1_4 = st.columns(4)
-    
-    with col1_1:
-        st.metric(
-            label="Touch Score", 
-            value=f"{st.session_state.touch_score:.2f}",
-            delta=None,
-            help="User's touch behavior anomaly score"
+    with col1:
+        st.markdown("### Configuration Panel")
+        
+        # Sliders for scores
+        st.markdown('<div class="slider-container">', unsafe_allow_html=True)
+        
+        # Touch score slider with unique key
+        touch_score = st.slider(
+            "Touch Behavior Score", 
+            min_value=0.0, 
+            max_value=1.0, 
+            value=st.session_state.touch_score,
+            step=0.01,
+            key="main_touch_score_slider",
+            help="Measure of how typical the user's touch patterns are (0 = anomalous, 1 = normal)"
         )
-    
-    with col1_2:
-        st.metric(
-            label="Typing Score", 
-            value=f"{st.session_state.typing_score:.2f}",
-            delta=None,
-            help="User's keystroke dynamics anomaly score"
+        st.session_state.touch_score = touch_score
+        
+        # Typing score slider with unique key
+        typing_score = st.slider(
+            "Typing Behavior Score", 
+            min_value=0.0, 
+            max_value=1.0, 
+            value=st.session_state.typing_score,
+            step=0.01,
+            key="main_typing_score_slider",
+            help="Measure of how typical the user's keystroke dynamics are (0 = anomalous, 1 = normal)"
         )
-    
-    with col1_3:
-        st.metric(
-            label="Usage Score", 
-            value=f"{st.session_state.usage_score:.2f}",
-            delta=None,
-            help="User's usage pattern anomaly score"
+        st.session_state.typing_score = typing_score
+        
+        # Usage score slider with unique key
+        usage_score = st.slider(
+            "Usage Pattern Score", 
+            min_value=0.0, 
+            max_value=1.0, 
+            value=st.session_state.usage_score,
+            step=0.01,
+            key="main_usage_score_slider",
+            help="Measure of how typical the user's app usage patterns are (0 = anomalous, 1 = normal)"
         )
-    
-    with col1_4:
-        st.metric(
-            label="Fusion Score", 
-            value=f"{final_score:.2f}",
-            delta=None,
-            help="Combined risk score"
+        st.session_state.usage_score = usage_score
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Calculate final score
+        final_score, risk_level, risk_class = score_and_risk(
+            st.session_state.touch_score,
+            st.session_state.typing_score,
+            st.session_state.usage_score
         )
-    
-    # Progress bar for risk level
-    st.markdown(f"**Risk Level: {risk_level}**")
-    if risk_level == "LOW":
-        st.progress(final_score / 0.4, text="Low Risk")
-    elif risk_level == "MEDIUM":
-        st.progress((final_score - 0.4) / 0.3, text="Medium Risk")
-    else:
-        st.progress((final_score - 0.7) / 0.3, text="High Risk")
-    
-    # Display final score and risk level in a card
-    st.markdown(f'<div class="score-card {risk_class}">', unsafe_allow_html=True)
-    st.markdown("### Fusion Engine Result")
-    st.markdown(f"#### Final Score: {final_score:.2f}")
-    st.markdown(f"#### Risk Level: **{risk_level}**")
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Generate explanations based on scores
-    st.markdown("### Anomaly Analysis")
-    
-    touch_explanation = get_touch_explanation(st.session_state.touch_score)
-    typing_explanation = get_typing_explanation(st.session_state.typing_score)
-    usage_explanation = get_usage_explanation(st.session_state.usage_score)
-    
-    st.markdown('<div class="explanation-box">', unsafe_allow_html=True)
-    st.markdown(f"**Touch Analysis:** {touch_explanation}")
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div class="explanation-box">', unsafe_allow_html=True)
-    st.markdown(f"**Typing Analysis:** {typing_explanation}")
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div class="explanation-box">', unsafe_allow_html=True)
-    st.markdown(f"**Usage Analysis:** {usage_explanation}")
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Display recommendation based on risk level
-    st.markdown("### Recommended Action")
-    if risk_level == "LOW":
-        st.success("✅ No action required. User behavior appears normal. Continue monitoring with standard protocols.")
-    elif risk_level == "MEDIUM":
-        st.warning("⚠️ Enhanced verification recommended. Consider requesting additional authentication factors.")
-    else:
-        st.error("🚨 Immediate action required. High probability of fraudulent activity. Initiate account protection protocols.")
+        
+        # Display metrics
+        col1_1, col1_2, col1_3, col1_4 = st.columns(4)
+        
+        with col1_1:
+            st.metric(
+                label="Touch Score", 
+                value=f"{st.session_state.touch_score:.2f}",
+                delta=None,
+                help="User's touch behavior anomaly score"
+            )
+        
+        with col1_2:
+            st.metric(
+                label="Typing Score", 
+                value=f"{st.session_state.typing_score:.2f}",
+                delta=None,
+                help="User's keystroke dynamics anomaly score"
+            )
+        
+        with col1_3:
+            st.metric(
+                label="Usage Score", 
+                value=f"{st.session_state.usage_score:.2f}",
+                delta=None,
+                help="User's usage pattern anomaly score"
+            )
+        
+        with col1_4:
+            st.metric(
+                label="Fusion Score", 
+                value=f"{final_score:.2f}",
+                delta=None,
+                help="Combined risk score"
+            )
+        
+        # Progress bar for risk level
+        st.markdown(f"**Risk Level: {risk_level}**")
+        if risk_level == "LOW":
+            st.progress(final_score / 0.4, text="Low Risk")
+        elif risk_level == "MEDIUM":
+            st.progress((final_score - 0.4) / 0.3, text="Medium Risk")
+        else:
+            st.progress((final_score - 0.7) / 0.3, text="High Risk")
+        
+        # Display final score and risk level in a card
+        st.markdown(f'<div class="score-card {risk_class}">', unsafe_allow_html=True)
+        st.markdown("### Fusion Engine Result")
+        st.markdown(f"#### Final Score: {final_score:.2f}")
+        st.markdown(f"#### Risk Level: **{risk_level}**")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Generate explanations based on scores
+        st.markdown("### Anomaly Analysis")
+        
+        touch_explanation = get_touch_explanation(st.session_state.touch_score)
+        typing_explanation = get_typing_explanation(st.session_state.typing_score)
+        usage_explanation = get_usage_explanation(st.session_state.usage_score)
+        
+        st.markdown('<div class="explanation-box">', unsafe_allow_html=True)
+        st.markdown(f"**Touch Analysis:** {touch_explanation}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="explanation-box">', unsafe_allow_html=True)
+        st.markdown(f"**Typing Analysis:** {typing_explanation}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="explanation-box">', unsafe_allow_html=True)
+        st.markdown(f"**Usage Analysis:** {usage_explanation}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Display recommendation based on risk level
+        st.markdown("### Recommended Action")
+        if risk_level == "LOW":
+            st.success("✅ No action required. User behavior appears normal. Continue monitoring with standard protocols.")
+        elif risk_level == "MEDIUM":
+            st.warning("⚠️ Enhanced verification recommended. Consider requesting additional authentication factors.")
+        else:
+            st.error("🚨 Immediate action required. High probability of fraudulent activity. Initiate account protection protocols.")
 
-with col2:
-    st.markdown("### Risk Visualization")
-    
-    # Create and display radar chart
-    radar_fig = create_radar_chart(
-        st.session_state.touch_score,
-        st.session_state.typing_score, 
-        st.session_state.usage_score, 
-        final_score
-    )
-    st.pyplot(radar_fig)
-    
-    # Create and display gauge chart
-    gauge_fig = create_gauge_chart(final_score)
-    st.pyplot(gauge_fig)
-    
-    # Score history trend chart
-    if st.session_state.score_history:
-        st.markdown("### Score Trends")
-        trend_fig = create_trend_chart(st.session_state.score_history)
-        if trend_fig:
-            st.pyplot(trend_fig)
-    
-    # History table
-    if st.session_state.score_history:
-        st.markdown("### Assessment History")
-        history_df = pd.DataFrame(st.session_state.score_history)
-        # Format timestamp for display
-        history_display = history_df.copy()
-        history_display['timestamp'] = history_display['timestamp'].apply(
-            lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if isinstance(x, datetime) else x
-        )
-        st.dataframe(
-            history_display.tail(5), 
-            use_container_width=True,
-            hide_index=True
+    with col2:
+        st.markdown("### Risk Visualization")
+        
+        # Create and display radar chart
+        radar_png = create_radar_chart(
+            chart_figure('radar', figsize=(8, 8), subplot_kw=dict(polar=True)),
+            st.session_state.touch_score,
+            st.session_state.typing_score, 
+            st.session_state.usage_score, 
+            final_score
         )
+        st.image(radar_png, width='stretch')
+        
+        # Create and display gauge chart
+        gauge_png = create_gauge_chart(chart_figure('gauge', figsize=(10, 4)), final_score)
+        st.image(gauge_png, width='stretch')
+        
+        # Score history trend chart
+        if st.session_state.score_history:
+            st.markdown("### Score Trends")
+            trend_fig = create_trend_chart(trend_rows(st.session_state.score_history))
+            if trend_fig:
+                st.plotly_chart(trend_fig)
+        
+        # History table
+        if st.session_state.score_history:
+            st.markdown("### Assessment History")
+            # Format timestamp for display
+            history_display = history_df().tail(5).copy()
+            history_display['timestamp'] = history_display['timestamp'].apply(
+                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if isinstance(x, datetime) else x
+            )
+            st.dataframe(
+                history_display, 
+                use_container_width=True,
+                hide_index=True
+            )
+
+render_dashboard()
 
 # Footer
 st.markdown("---")
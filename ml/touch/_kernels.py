@@ -0,0 +1,60 @@
+"""
+Optional Numba kernels for the persistent touch scorer.
+
+mse_kernel(X, present, scale, power, out) -> None
+    X float64[B, F], present bool[B, F], scale float64[F], power float,
+    out float64[B]. Per row, the mean of (x / scale)**power over the present
+    features (callers pass power=2.0), leaving out finite values whose power
+    overflows (0.0 when none remain); NaN and inf values are kept. Same
+    semantics as compute_mse.
+
+mse_kernel is None when numba is not installed; callers keep their NumPy
+path in that case. serve_sklearn.py only imports this module when
+TOUCH_SCORE_NUMBA=1, since the import compiles the kernel.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _mse_kernel(X, present, scale, power, out):
+    rows, cols = X.shape
+    for r in range(rows):
+        s = 0.0
+        n = 0
+        for i in range(cols):
+            if not present[r, i]:
+                continue
+            v = X[r, i] / scale[i]
+            # power is an argument, not a literal: LLVM folds pow(v, 2.0) into
+            # v * v, which rounds differently from compute_mse's ** 2
+            sq = math.pow(v, power)
+            if math.isinf(sq) and math.isfinite(v):
+                continue  # overflowed, as in compute_mse
+            s += sq
+            n += 1
+        out[r] = s / n if n else 0.0
+
+
+if njit is not None:
+    # No fastmath: it assumes no NaNs or infs and would break the overflow
+    # check and NaN/inf propagation.
+    # No parallel: rows per call are few and threads only add startup cost.
+    # No cache=True: the cached entry records the importing module name, so
+    # a cache written under "_kernels" (script run) breaks "ml.touch._kernels".
+    mse_kernel = njit(_mse_kernel)
+
+    # Compile at import so the first request doesn't pay the JIT cost
+    _warm = np.zeros((1, 1), dtype=np.float64)
+    mse_kernel(
+        _warm, np.ones((1, 1), dtype=np.bool_), np.ones(1, dtype=np.float64), 2.0,
+        np.empty(1, dtype=np.float64),
+    )
+    del _warm
+else:
+    mse_kernel = None
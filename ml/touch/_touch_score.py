@@ -0,0 +1,44 @@
+"""
+Shared TouchAgent feature scoring, standard library only.
+
+compute_mse(features) -> float
+    Mean of (value / scale)**2 over the features in SCALES that are present
+    and numeric (0.0 when there are none). Values that cannot be squared as a
+    float (ints too large for a float, finite values whose square overflows)
+    are left out of the mean; NaN and infinite values are kept, so they make
+    the result NaN or inf.
+
+Import this once from a long-lived host process and call compute_mse directly
+instead of spawning score_once_sklearn.py per gesture. serve_sklearn.py is the
+supported fast path for callers that need a separate process.
+"""
+
+SCALES = {
+    "duration_ms": 500.0,
+    "total_distance": 300.0,
+    "avg_velocity": 1.0,
+    "peak_velocity": 5.0,
+    "avg_pressure": 1.0,
+    "peak_pressure": 1.0,
+    "path_deviation": 5.0,
+    "direction_changes": 5.0,
+    "jitter": 3.0,
+}
+
+KEYS = tuple(SCALES)
+
+
+def compute_mse(features: dict) -> float:
+    # A plain loop beats NumPy dispatch for nine values and keeps the import cheap
+    s = 0.0
+    n = 0
+    for k, scale in SCALES.items():
+        v = features.get(k)
+        if isinstance(v, (int, float)):
+            try:
+                sq = (float(v) / scale) ** 2
+            except OverflowError:
+                continue  # int too large for a float, or the square overflows
+            s += sq
+            n += 1
+    return s / n if n else 0.0
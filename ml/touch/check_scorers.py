@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Check that score_once_sklearn.py and serve_sklearn.py give the same answers.
+
+Runs both entry points as the Java bridge does (a process per payload, and one
+persistent process fed JSON lines) on edge-case payloads: NaN, +/-Infinity,
+ints too large for a float, squares that overflow, missing and non-numeric
+values. Prints any disagreement and exits non-zero on failure.
+
+    python ml/touch/check_scorers.py
+    TOUCH_SCORE_NUMBA=1 python ml/touch/check_scorers.py
+"""
+import os
+import sys
+import json
+import math
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (payload line, expected mse); None means "only compare the two scorers"
+CASES = [
+    ('{"duration_ms": 250, "jitter": Infinity}', math.inf),
+    ('{"duration_ms": 250, "jitter": -Infinity}', math.inf),
+    ('{"duration_ms": 250, "jitter": NaN}', math.nan),
+    ('{"duration_ms": 250, "jitter": 1' + "0" * 400 + '}', 0.25),
+    ('{"duration_ms": 250, "jitter": 1e200}', 0.25),
+    ('{"duration_ms": 250, "jitter": "x", "avg_velocity": null}', 0.25),
+    ('{"duration_ms": 250}', 0.25),
+    ('{}', 0.0),
+    ('{"duration_ms": 1e154, "total_distance": 123456789, "jitter": 0.1}', None),
+    ('{"avg_velocity": 0.3333333333333333, "peak_velocity": 7.77}', None),
+]
+
+
+def _same(a, b) -> bool:
+    return a == b or (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b))
+
+
+def run_once(line: str) -> dict:
+    p = subprocess.run(
+        [sys.executable, os.path.join(HERE, "score_once_sklearn.py")],
+        input=line.encode(), capture_output=True, check=True,
+    )
+    return json.loads(p.stdout)
+
+
+def run_serve(lines: list) -> list:
+    p = subprocess.run(
+        [sys.executable, os.path.join(HERE, "serve_sklearn.py")],
+        input=("\n".join(lines) + "\n").encode(), capture_output=True, check=True,
+    )
+    if p.stderr:
+        raise RuntimeError(f"serve_sklearn.py wrote to stderr: {p.stderr.decode()}")
+    return [json.loads(s) for s in p.stdout.decode().splitlines()]
+
+
+def main() -> int:
+    lines = [line for line, _ in CASES]
+    served = run_serve(lines)
+    if len(served) != len(lines):
+        print(f"serve_sklearn.py answered {len(served)} of {len(lines)} lines")
+        return 1
+    failed = 0
+    for (line, expected), srv in zip(CASES, served):
+        once = run_once(line)
+        problems = []
+        for key in ("ok", "mse", "score"):
+            if not _same(once.get(key), srv.get(key)):
+                problems.append(f"{key}: score_once {once.get(key)!r} != serve {srv.get(key)!r}")
+        if expected is not None and not _same(once.get("mse"), expected):
+            problems.append(f"mse: expected {expected!r}, got {once.get('mse')!r}")
+        if problems:
+            failed += 1
+            print(line[:80])
+            for p in problems:
+                print("  " + p)
+    print(f"{len(CASES) - failed}/{len(CASES)} payloads agree")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,14 +15,28 @@ Provided functions:
 - load_map(path) -> Dict[str, float]
 - save_map(path, mapping) -> None
 - to_numeric(gesture, mapping, default=None) -> float
-- from_numeric(value, mapping, tol=1e-6) -> str
+- build_inverse(mapping, tol=1e-6) -> Dict[int, str]
+- from_numeric(value, mapping, tol=1e-6, inverse=None) -> str
+- to_numeric_array(gestures, mapping, default=None) -> np.ndarray[float32]
+- from_numeric_array(values, mapping, tol=1e-6) -> np.ndarray[str]
+- known_mask(labels, keys) -> np.ndarray[bool] for a categorical Series
+- encode_categorical(labels, mapping) -> np.ndarray[float32], NaN for unknowns
 - ensure_supported(gestures, mapping) -> set[str] of unknowns
 """
 from __future__ import annotations
 
 import json
+import math
 from typing import Dict, Iterable, Optional
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used otherwise
+    orjson = None
+
 # Default binary mapping; extend if you add more gesture types.
 DEFAULT_MAP: Dict[str, float] = {
     "TAP": 0.0,
@@ -39,19 +53,26 @@ def load_map(path: str) -> Dict[str, float]:
     """Load a gesture mapping from a JSON file.
 
     The JSON must be an object of string keys (labels) to numeric values.
+    Parsed with orjson when it is installed.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
     if not isinstance(data, dict):
         raise ValueError("Gesture map JSON must be an object {label: value, ...}")
-    mapping: Dict[str, float] = {}
-    for k, v in data.items():
-        if not isinstance(k, str):
-            raise ValueError("Gesture map keys must be strings")
-        try:
-            mapping[k] = float(v)
-        except Exception as e:
-            raise ValueError(f"Gesture map value for '{k}' must be numeric") from e
+    # JSON object keys are always strings; only the values need checking
+    try:
+        mapping: Dict[str, float] = {k: float(v) for k, v in data.items()}
+    except (TypeError, ValueError):
+        for k, v in data.items():
+            try:
+                float(v)
+            except Exception as e:
+                raise ValueError(f"Gesture map value for '{k}' must be numeric") from e
+        raise
     if not mapping:
         raise ValueError("Gesture map is empty")
     return mapping
@@ -75,18 +96,114 @@ def to_numeric(gesture: str, mapping: Dict[str, float], default: Optional[float]
     raise KeyError(f"Unknown gesture label: {gesture}")
 
 
-def from_numeric(value: float, mapping: Dict[str, float], tol: float = 1e-6) -> str:
+def build_inverse(mapping: Dict[str, float], tol: float = 1e-6) -> Dict[int, str]:
+    """Build a reverse lookup for from_numeric, keyed by value bucketed to tol.
+
+    Build once and pass it to from_numeric when decoding many values.
+    """
+    inverse: Dict[int, str] = {}
+    for k, v in mapping.items():
+        inverse.setdefault(int(round(float(v) / tol)), k)
+    return inverse
+
+
+def from_numeric(
+    value: float,
+    mapping: Dict[str, float],
+    tol: float = 1e-6,
+    inverse: Optional[Dict[int, str]] = None,
+) -> str:
     """Inverse mapping: numeric value to the closest matching label within tol.
 
+    If inverse (from build_inverse with the same tol) is given, the lookup is a
+    dict hit instead of a scan over the mapping.
     Raises KeyError if no label matches within tolerance.
     """
+    value = float(value)
+    if inverse is not None:
+        scaled = value / tol
+        if not math.isfinite(scaled):
+            # NaN/inf (or a value too large to bucket) can't match within tol
+            raise KeyError(f"No label found for numeric value {value}")
+        bucket = int(round(scaled))
+        # A match within tol may land in a neighbouring bucket
+        for b in (bucket, bucket - 1, bucket + 1):
+            k = inverse.get(b)
+            if k is not None and abs(float(mapping[k]) - value) <= tol:
+                return k
+        raise KeyError(f"No label found for numeric value {value}")
     for k, v in mapping.items():
-        if abs(float(v) - float(value)) <= tol:
+        if abs(float(v) - value) <= tol:
             return k
     raise KeyError(f"No label found for numeric value {value}")
 
 
+def to_numeric_array(
+    gestures: Iterable[str], mapping: Dict[str, float], default: Optional[float] = None
+) -> np.ndarray:
+    """Vectorized to_numeric over a sequence of labels, returned as float32.
+
+    If any label is unknown and default is None, raises KeyError.
+    """
+    # Labels are factorized once; the mapping is then a table lookup by code
+    s = pd.Series(gestures, dtype="category")
+    mapped = encode_categorical(s, mapping)
+    missing = np.isnan(mapped)
+    if missing.any():
+        if default is None:
+            raise KeyError(f"Unknown gesture label: {s.iloc[int(missing.argmax())]}")
+        mapped[missing] = float(default)
+    return mapped
+
+
+def from_numeric_array(values: Iterable[float], mapping: Dict[str, float], tol: float = 1e-6) -> np.ndarray:
+    """Vectorized from_numeric: nearest label for each value, within tol.
+
+    Raises KeyError if any value has no label within tolerance.
+    """
+    arr = np.asarray(values, dtype=np.float64).ravel()
+    if not mapping:
+        if arr.size:
+            raise KeyError(f"No label found for numeric value {arr[0]}")
+        return np.empty(0, dtype=object)
+    labels = np.array(list(mapping.keys()), dtype=object)
+    mvals = np.array([float(v) for v in mapping.values()], dtype=np.float64)
+    order = np.argsort(mvals, kind="stable")
+    labels, mvals = labels[order], mvals[order]
+    # Nearest of the two sorted neighbours around each insertion point
+    hi = np.clip(np.searchsorted(mvals, arr), 0, len(mvals) - 1)
+    lo = np.clip(hi - 1, 0, len(mvals) - 1)
+    idx = np.where(np.abs(mvals[lo] - arr) <= np.abs(mvals[hi] - arr), lo, hi)
+    # Written as "not within tol" so NaN counts as no match, like from_numeric
+    bad = ~(np.abs(mvals[idx] - arr) <= tol)
+    if bad.any():
+        raise KeyError(f"No label found for numeric value {arr[bad][0]}")
+    return labels[idx]
+
+
+def known_mask(labels: pd.Series, keys: Iterable[str]) -> np.ndarray:
+    """Boolean mask of rows whose label is in keys, for a categorical Series.
+
+    Membership is tested once per category rather than once per row.
+    """
+    known = np.asarray(labels.cat.categories.isin(keys), dtype=bool)
+    # Missing labels have code -1, which indexes the trailing False
+    return np.append(known, False)[labels.cat.codes.to_numpy()]
+
+
+def encode_categorical(labels: pd.Series, mapping: Dict[str, float]) -> np.ndarray:
+    """to_numeric over a categorical Series as float32, NaN for unknown labels.
+
+    The mapping is applied once per category and rows are decoded by code.
+    """
+    lut = np.array(
+        [mapping.get(c, np.nan) for c in labels.cat.categories] + [np.nan], dtype=np.float32
+    )
+    # Missing labels have code -1, which indexes the trailing NaN
+    return lut[labels.cat.codes.to_numpy()]
+
+
 def ensure_supported(gestures: Iterable[str], mapping: Dict[str, float]) -> set[str]:
     """Return set of labels from gestures that are not present in mapping."""
-    mkeys = set(mapping.keys())
-    return {g for g in gestures if g not in mkeys}
+    # Dict membership is already a hash lookup; no need to copy the keys
+    return set(gestures).difference(mapping)
@@ -4,6 +4,7 @@ General inference script for the Touch autoencoder.
 Supports two modes:
 - sklearn: loads model.joblib + scaler.joblib + threshold.json from a directory
 - tflite:  loads touch_ae.tflite + scaler.json + threshold.json from given paths
+           (scaler.json is not needed for models trained with --fuse_scaler)
 
 Input CSV format (no header, one gesture per row):
 gesture,duration_ms,total_distance,avg_velocity,peak_velocity,avg_pressure,peak_pressure,path_deviation,direction_changes,jitter
@@ -11,6 +12,9 @@ gesture,duration_ms,total_distance,avg_velocity,peak_velocity,avg_pressure,peak_
 Example:
 SWIPE,250,137.11946,0.5484778,0.62185323,0.70933867,0.9875791,0.4828847,0,0.35521233
 
+The CSV is parsed with pyarrow when it is installed (faster on large inputs),
+falling back to pandas.
+
 Output:
 - Prints summary stats to stdout
 - Optionally writes a CSV with appended columns: mse,score
@@ -20,41 +24,89 @@ python ml/touch/infer_autoencoder.py --csv data\normal_touch_features_20250824_1
 python ml\touch\infer_autoencoder.py --csv data\normal_touch_features_20250824_152548.csv --tflite models\touch_ae_tflite_tf\touch_ae.tflite --scaler models\touch_ae_tflite_tf\scaler.json --threshold models\touch_ae_tflite_tf\threshold.json --out scores_tflite.csv
 """
 import argparse
+import functools
+import inspect
 import json
 import os
 import sys
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # optional, pandas parses the CSV otherwise
+    pacsv = None
+
 # Support both module and direct script execution
 try:
-    from .gesture_map import get_default_map  # type: ignore
+    from .gesture_map import get_default_map, from_numeric_array, known_mask, encode_categorical  # type: ignore
 except Exception:
     import os as _os, sys as _sys
     _sys.path.append(_os.path.abspath(_os.path.join(_os.path.dirname(__file__), "..", "..")))
-    from ml.touch.gesture_map import get_default_map  # type: ignore
-
-
-def load_csv(csv_path: str) -> Tuple[np.ndarray, List[str]]:
-    # Robust load: ignore blank lines; filter to rows that start with known gestures
-    df = pd.read_csv(csv_path, header=None, skip_blank_lines=True)
+    from ml.touch.gesture_map import get_default_map, from_numeric_array, known_mask, encode_categorical  # type: ignore
+
+
+NAMES = [
+    "gesture", "duration_ms", "total_distance", "avg_velocity", "peak_velocity",
+    "avg_pressure", "peak_pressure", "path_deviation", "direction_changes", "jitter"
+]
+FEATS = ["gesture_num"] + NAMES[1:]
+_GKEYS = frozenset(get_default_map())
+
+
+def _read_csv_pandas(csv_path: str, gesture_map) -> pd.DataFrame:
+    # Feature dtypes are inferred, so --out writes the input values as they
+    # were read. Stray non-numeric rows (e.g. a header line) are filtered out
+    # by gesture; their columns then stay as text and are converted with X.
+    df = pd.read_csv(
+        csv_path, header=None, names=NAMES, dtype={"gesture": "category"}, skip_blank_lines=True, engine="c",
+    )
+    df = df[known_mask(df["gesture"], _GKEYS)].copy()
+    df["gesture"] = encode_categorical(df["gesture"], gesture_map)
+    return df
+
+
+def _read_csv_arrow(csv_path: str, gesture_map) -> pd.DataFrame:
+    # Multi-threaded columnar parse; rows with unknown gestures are dropped
+    # and gestures are encoded from their index in the known labels.
+    # Feature types are inferred, as in the pandas reader.
+    table = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(column_names=NAMES, block_size=1 << 20),
+        convert_options=pacsv.ConvertOptions(column_types={"gesture": pa.string()}),
+    )
+    labels = list(gesture_map)
+    idx = pc.index_in(table["gesture"], value_set=pa.array(labels))
+    known = pc.is_valid(idx)
+    table = table.filter(known)
+    values = np.array([gesture_map[k] for k in labels], dtype=np.float32)
+    codes = values[idx.filter(known).to_numpy(zero_copy_only=False)]
+    table = table.set_column(0, "gesture", pa.array(codes))
+    return table.to_pandas()
+
+
+def load_csv(csv_path: str) -> Tuple[np.ndarray, List[str], pd.DataFrame]:
+    # Robust load: ignore blank lines; filter to rows that start with known gestures.
+    # Gestures are parsed as a category and encoded per category (unknown labels become NaN).
+    # The returned frame keeps the feature columns as read; only X is float32.
     gesture_map = get_default_map()
-    df = df[df[0].astype(str).isin(gesture_map.keys())].copy()
+    df = None
+    if pacsv is not None:
+        try:
+            df = _read_csv_arrow(csv_path, gesture_map)
+        except pa.ArrowInvalid:
+            pass  # e.g. ragged rows; let pandas parse or report it
+    if df is None:
+        df = _read_csv_pandas(csv_path, gesture_map)
+    df = df.dropna(subset=["gesture"])
     if df.empty:
         raise ValueError("No valid rows found. Ensure first column is one of: " + ", ".join(gesture_map.keys()))
-    df.columns = [
-        "gesture", "duration_ms", "total_distance", "avg_velocity", "peak_velocity",
-        "avg_pressure", "peak_pressure", "path_deviation", "direction_changes", "jitter"
-    ]
-    df["gesture_num"] = df["gesture"].map(gesture_map).astype(float)
-    feats = [
-        "gesture_num", "duration_ms", "total_distance", "avg_velocity", "peak_velocity",
-        "avg_pressure", "peak_pressure", "path_deviation", "direction_changes", "jitter"
-    ]
-    X = df[feats].astype(float).to_numpy()
-    return X, feats
+    X = df[NAMES].to_numpy(dtype=np.float32)
+    return X, FEATS, df
 
 
 def load_json(path: str):
@@ -70,14 +122,26 @@ def load_threshold(threshold_path: str) -> float:
     return float(thr)
 
 
-def standardize_with_json(X: np.ndarray, scaler_json_path: str) -> np.ndarray:
+@functools.lru_cache(maxsize=4)
+def _load_scaler(scaler_json_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    # (mean, 1/scale) as float32; cached arrays are read-only since they are shared
     data = load_json(scaler_json_path)
     mean = np.asarray(data["mean"], dtype=np.float32)
     scale = np.asarray(data["scale"], dtype=np.float32)
-    if mean.shape[0] != X.shape[1] or scale.shape[0] != X.shape[1]:
+    inv_scale = (1.0 / np.where(scale == 0.0, 1.0, scale)).astype(np.float32)
+    mean.flags.writeable = False
+    inv_scale.flags.writeable = False
+    return mean, inv_scale
+
+
+def standardize_with_json(X: np.ndarray, scaler_json_path: str) -> np.ndarray:
+    mean, inv_scale = _load_scaler(scaler_json_path)
+    if mean.shape[0] != X.shape[1] or inv_scale.shape[0] != X.shape[1]:
         raise ValueError(f"Scaler dim {mean.shape[0]} does not match input dim {X.shape[1]}")
-    scale_safe = np.where(scale == 0.0, 1.0, scale)
-    return (X - mean) / scale_safe
+    Xs = np.empty(X.shape, dtype=np.float32)
+    np.subtract(X, mean, out=Xs)
+    np.multiply(Xs, inv_scale, out=Xs)
+    return Xs
 
 
 def try_import_joblib():
@@ -88,83 +152,142 @@ def try_import_joblib():
         return False
 
 
-def score_with_sklearn(X: np.ndarray, model_dir: str) -> Tuple[np.ndarray, float]:
-    if not try_import_joblib():
-        raise RuntimeError("joblib not installed. pip install joblib scikit-learn")
+@functools.lru_cache(maxsize=4)
+def _load_sklearn(model_dir: str):
+    # (model, scaler) deserialized once per directory; scaler is None when only
+    # scaler.json is present (that path is cached by _load_scaler)
     import joblib
 
     model_path = os.path.join(model_dir, "model.joblib")
     scaler_path_joblib = os.path.join(model_dir, "scaler.joblib")
     scaler_path_json = os.path.join(model_dir, "scaler.json")
-    threshold_path = os.path.join(model_dir, "threshold.json")
 
     if os.path.isfile(scaler_path_joblib):
         scaler = joblib.load(scaler_path_joblib)
-        Xs = scaler.transform(X)
     elif os.path.isfile(scaler_path_json):
-        Xs = standardize_with_json(X, scaler_path_json)
+        scaler = None
     else:
         raise FileNotFoundError(f"No scaler found at {scaler_path_joblib} or {scaler_path_json}")
+    return joblib.load(model_path), scaler
+
+
+def score_with_sklearn(X: np.ndarray, model_dir: str) -> Tuple[np.ndarray, float]:
+    if not try_import_joblib():
+        raise RuntimeError("joblib not installed. pip install joblib scikit-learn")
 
-    model = joblib.load(model_path)
-    recon = model.predict(Xs)
+    threshold_path = os.path.join(model_dir, "threshold.json")
+    model, scaler = _load_sklearn(model_dir)
+    # float32 end to end; sklearn transforms/predictions may come back float64
+    if scaler is not None:
+        Xs = np.asarray(scaler.transform(X), dtype=np.float32)
+    else:
+        Xs = standardize_with_json(X, os.path.join(model_dir, "scaler.json"))
+
+    recon = np.asarray(model.predict(Xs), dtype=np.float32)
     if recon.shape != Xs.shape:
         raise ValueError(f"Model output shape {recon.shape} != input shape {Xs.shape}. "
                          "Expected an autoencoder reconstructing inputs.")
 
-    mse = ((Xs - recon) ** 2).mean(axis=1)
+    # Squared error in one reused buffer
+    diff = np.empty_like(Xs)
+    np.subtract(Xs, recon, out=diff)
+    np.square(diff, out=diff)
+    mse = diff.mean(axis=1)
     thr = load_threshold(threshold_path)
     return mse, thr
 
 
+def _make_interpreter(Interpreter, tflite_path: str):
+    # Multi-threaded invoke (XNNPACK is on by default); older builds lack num_threads
+    kwargs = {}
+    if "num_threads" in inspect.signature(Interpreter).parameters:
+        kwargs["num_threads"] = os.cpu_count() or 2
+    return Interpreter(model_path=tflite_path, **kwargs)
+
+
 def get_tflite_interpreter(tflite_path: str):
     try:
         from tflite_runtime.interpreter import Interpreter  # type: ignore
-        return Interpreter(model_path=tflite_path)
+        return _make_interpreter(Interpreter, tflite_path)
     except Exception:
         try:
             from tensorflow.lite.python.interpreter import Interpreter  # type: ignore
-            return Interpreter(model_path=tflite_path)
+            return _make_interpreter(Interpreter, tflite_path)
         except Exception as e:
             raise RuntimeError("Neither tflite_runtime nor TensorFlow Lite is available.") from e
 
 
-def score_with_tflite(X: np.ndarray, tflite_path: str, scaler_path: str, threshold_path: str) -> Tuple[np.ndarray, float]:
-    # Standardize
-    if scaler_path.endswith(".json"):
-        Xs = standardize_with_json(X, scaler_path)
-    else:
-        if not try_import_joblib():
-            raise RuntimeError("joblib not installed. pip install joblib scikit-learn")
-        import joblib
-        scaler = joblib.load(scaler_path)
-        Xs = scaler.transform(X)
-
+def score_with_tflite(X: np.ndarray, tflite_path: str, scaler_path: Optional[str], threshold_path: str) -> Tuple[np.ndarray, float]:
     # TFLite inference
     itp = get_tflite_interpreter(tflite_path)
     itp.allocate_tensors()
     inp = itp.get_input_details()[0]
     out = itp.get_output_details()[0]
 
+    # Models exported with --fuse_scaler standardize in-graph and return the
+    # per-row MSE ([N, 1]); they take raw features and need no scaler.
+    # A scaler.json is applied per batch while filling the input buffer.
+    fused = len(out["shape"]) == 2 and out["shape"][1] == 1
+    mean = inv_scale = None
+    Xs = X
+    if fused:
+        pass
+    elif scaler_path is None:
+        raise ValueError("A scaler is required for TFLite models that output a reconstruction.")
+    elif scaler_path.endswith(".json"):
+        mean, inv_scale = _load_scaler(scaler_path)
+        if mean.shape[0] != X.shape[1] or inv_scale.shape[0] != X.shape[1]:
+            raise ValueError(f"Scaler dim {mean.shape[0]} does not match input dim {X.shape[1]}")
+    else:
+        if not try_import_joblib():
+            raise RuntimeError("joblib not installed. pip install joblib scikit-learn")
+        import joblib
+        scaler = joblib.load(scaler_path)
+        Xs = np.asarray(scaler.transform(X), dtype=np.float32)
+
     # Ensure input dims match
     d = Xs.shape[1]
     expected = inp["shape"][1] if len(inp["shape"]) == 2 else d
     if expected != d:
         raise ValueError(f"TFLite model expects dim={expected}, but got {d} features.")
 
-    # Run in batches
+    # Run in batches. Tensors are sized for a full batch once; only a short
+    # trailing batch needs another resize + allocate.
     batch_size = 128
-    mse_list = []
-    for i in range(0, Xs.shape[0], batch_size):
-        xb = Xs[i:i+batch_size].astype(np.float32)
-        itp.resize_tensor_input(inp["index"], [xb.shape[0], d])
-        itp.allocate_tensors()
-        itp.set_tensor(inp["index"], xb)
-        itp.invoke()
-        recon = itp.get_tensor(out["index"]).astype(np.float32)
-        mse = ((xb - recon) ** 2).mean(axis=1)
-        mse_list.append(mse)
-    mse = np.concatenate(mse_list, axis=0)
+    n = Xs.shape[0]
+    inp_index = inp["index"]
+    out_index = out["index"]
+    full = min(batch_size, n)
+    itp.resize_tensor_input(inp_index, [full, d])
+    itp.allocate_tensors()
+    mse = np.empty(n, dtype=np.float32)
+    # tensor() handles give views of the interpreter's buffers instead of the
+    # copies made by set_tensor/get_tensor. invoke() refuses to run while a
+    # view is alive, so views are only taken as temporaries.
+    in_view, out_view, invoke = itp.tensor(inp_index), itp.tensor(out_index), itp.invoke
+    buf = np.empty((full, d), dtype=np.float32)
+    diff = np.empty((full, d), dtype=np.float32)
+    for i in range(0, n, batch_size):
+        j = min(i + batch_size, n)
+        b = j - i
+        if b != full:
+            itp.resize_tensor_input(inp_index, [b, d])
+            itp.allocate_tensors()
+        xb = buf[:b]
+        if mean is not None:
+            np.subtract(Xs[i:j], mean, out=xb)
+            np.multiply(xb, inv_scale, out=xb)
+        else:
+            xb[...] = Xs[i:j]
+        np.copyto(in_view(), xb)
+        invoke()
+        if fused:
+            mse[i:j] = out_view()[:, 0]
+            continue
+        db = diff[:b]
+        np.subtract(xb, out_view(), out=db)
+        np.square(db, out=db)
+        db.mean(axis=1, out=mse[i:j])
 
     thr = load_threshold(threshold_path)
     return mse, thr
@@ -177,29 +300,37 @@ def main():
     group = ap.add_mutually_exclusive_group(required=True)
     group.add_argument("--sklearn_dir", help="Directory with model.joblib, scaler.(joblib|json), threshold.json")
     group.add_argument("--tflite", help="Path to .tflite model for inference")
-    ap.add_argument("--scaler", help="Path to scaler.json or scaler.joblib (required for --tflite)")
+    ap.add_argument("--scaler", help="Path to scaler.json or scaler.joblib (--tflite; not needed for --fuse_scaler models)")
     ap.add_argument("--threshold", help="Path to threshold.json (required for --tflite)")
     args = ap.parse_args()
 
-    X, feats = load_csv(args.csv)
+    X, feats, df = load_csv(args.csv)
 
     if args.sklearn_dir:
         mse, thr = score_with_sklearn(X, args.sklearn_dir)
     else:
-        if not args.scaler or not args.threshold:
-            print("--scaler and --threshold are required with --tflite", file=sys.stderr)
+        if not args.threshold:
+            print("--threshold is required with --tflite", file=sys.stderr)
             sys.exit(2)
         mse, thr = score_with_tflite(X, args.tflite, args.scaler, args.threshold)
 
-    scores = np.minimum(1.0, mse / float(thr))
+    scores = np.empty_like(mse)
+    np.divide(mse, float(thr), out=scores)
+    np.clip(scores, 0.0, 1.0, out=scores)
+    # One pass for both tail fractions. Edges are nudged up so 0.5 and 0.8
+    # themselves fall in the lower bin, matching the strict > comparisons.
+    edges = np.array([-np.inf, 0.5, 0.8, np.inf], dtype=scores.dtype)
+    edges[1:3] = np.nextafter(edges[1:3], np.inf)
+    counts, _ = np.histogram(scores, bins=edges)
+    n = max(len(scores), 1)
+    frac_gt_8 = counts[2] / n
+    frac_gt_5 = (counts[1] + counts[2]) / n
     print(f"Samples={len(scores)}  MSE mean={mse.mean():.6f} std={mse.std():.6f}  thr={thr:.6f}")
-    print(f"Score mean={scores.mean():.4f}  >0.8={(scores>0.8).mean():.2%}  >0.5={(scores>0.5).mean():.2%}")
+    print(f"Score mean={scores.mean():.4f}  >0.8={frac_gt_8:.2%}  >0.5={frac_gt_5:.2%}")
 
     if args.out:
-        # Append mse and score to the original CSV rows
-        df = pd.read_csv(args.csv, header=None, skip_blank_lines=True)
-        gesture_map = get_default_map()
-        df = df[df[0].astype(str).isin(gesture_map.keys())].copy()
+        # Append mse and score to the rows kept by load_csv, with gesture labels restored
+        df["gesture"] = from_numeric_array(df["gesture"].to_numpy(), get_default_map())
         df["mse"] = mse
         df["score"] = scores
         df.to_csv(args.out, index=False, header=False)
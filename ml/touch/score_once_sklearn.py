@@ -1,43 +1,36 @@
 #!/usr/bin/env python3
 import sys
 import json
-import argparse
 
-# Minimal, dependency-free scorer for TouchAgent features.
-# Reads one JSON object from stdin and prints a JSON result to stdout.
-# This simulates a sklearn AE scorer without requiring external packages.
-
-SCALES = {
-    "duration_ms": 500.0,
-    "total_distance": 300.0,
-    "avg_velocity": 1.0,
-    "peak_velocity": 5.0,
-    "avg_pressure": 1.0,
-    "peak_pressure": 1.0,
-    "path_deviation": 5.0,
-    "direction_changes": 5.0,
-    "jitter": 3.0,
-}
+# Shared scorer; works both as a package module and as a script
+try:
+    from ._touch_score import compute_mse
+except ImportError:
+    from _touch_score import compute_mse
 
-
-def compute_mse(features: dict) -> float:
-    vals = []
-    for k, scale in SCALES.items():
-        v = features.get(k)
-        if isinstance(v, (int, float)):
-            try:
-                vals.append((float(v) / scale) ** 2)
-            except Exception:
-                pass
-    if not vals:
-        return 0.0
-    return sum(vals) / len(vals)
+# Minimal scorer for TouchAgent features (standard library only).
+# Reads one JSON object from stdin and prints a JSON result to stdout.
+# This simulates a sklearn AE scorer without requiring an ML framework.
+#
+# Deprecated for repeated scoring: each call pays interpreter startup.
+# Use serve_sklearn.py (one process, JSON lines) or import
+# _touch_score.compute_mse in-process instead.
+DEPRECATION = (
+    "score_once_sklearn.py starts a new process per gesture; "
+    "use serve_sklearn.py (persistent) or _touch_score.compute_mse instead"
+)
 
 
 def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--model', type=str, required=False, default='models/touch_ae_sklearn')
-    _ = parser.parse_args()
+    # Nothing to parse in the common case; argparse is only loaded for flags
+    if sys.argv[1:]:
+        import argparse
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--model', type=str, required=False, default='models/touch_ae_sklearn')
+        _ = parser.parse_args()
+    # Only for interactive use: bridges may merge stderr into the JSON stream
+    if sys.stderr.isatty():
+        print(DEPRECATION, file=sys.stderr)
 
     try:
         payload = sys.stdin.read()
@@ -1,36 +1,130 @@
 #!/usr/bin/env python3
+import os
 import sys
 import json
 import argparse
 
-# Minimal, dependency-free persistent scorer.
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _loads(line: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass  # e.g. ints beyond 64 bits, which json accepts; let it decide
+    return json.loads(line)
+
+# Shared scorer; works both as a package module and as a script
+try:
+    from ._touch_score import KEYS, SCALES, compute_mse  # noqa: F401 (compute_mse re-exported)
+except ImportError:
+    from _touch_score import KEYS, SCALES, compute_mse  # noqa: F401
+
+# Optional Numba kernel, opt-in with TOUCH_SCORE_NUMBA=1. Importing numba and
+# compiling adds most of a second to startup, which the Java bridge's
+# first-request timeout also has to cover.
+mse_kernel = None
+if os.environ.get("TOUCH_SCORE_NUMBA") == "1":
+    try:
+        from ._kernels import mse_kernel
+    except ImportError:
+        from _kernels import mse_kernel
+
+# Minimal persistent scorer (NumPy only).
 # For each line of JSON on stdin, prints one line of JSON result on stdout.
 
-SCALES = {
-    "duration_ms": 500.0,
-    "total_distance": 300.0,
-    "avg_velocity": 1.0,
-    "peak_velocity": 5.0,
-    "avg_pressure": 1.0,
-    "peak_pressure": 1.0,
-    "path_deviation": 5.0,
-    "direction_changes": 5.0,
-    "jitter": 3.0,
-}
-
-
-def compute_mse(features: dict) -> float:
-    vals = []
-    for k, scale in SCALES.items():
-        v = features.get(k)
-        if isinstance(v, (int, float)):
+# Lines already waiting on stdin are scored together, up to this many
+MAX_BATCH = 64
+READ_SIZE = 1 << 16
+
+# float64 throughout: responses must match compute_mse digit for digit
+SCALE = np.array([SCALES[k] for k in KEYS], dtype=np.float64)
+
+# Per-process input/output buffers for a batch of rows
+_buf = np.empty((MAX_BATCH, len(KEYS)), dtype=np.float64)
+_present = np.empty((MAX_BATCH, len(KEYS)), dtype=np.bool_)
+_out = np.empty(MAX_BATCH, dtype=np.float64)
+
+
+def features_row(features: dict) -> tuple:
+    """Feature values in KEYS order as floats, and which of them are present.
+
+    Non-numeric values and ints too large for a float are not present, as in
+    compute_mse, and hold 0.0. NaN and inf are real values and stay present.
+    """
+    row, present = [], []
+    for v in map(features.get, KEYS):
+        ok = isinstance(v, (int, float))
+        if ok:
             try:
-                vals.append((float(v) / scale) ** 2)
-            except Exception:
-                pass
-    if not vals:
-        return 0.0
-    return sum(vals) / len(vals)
+                v = float(v)
+            except OverflowError:
+                ok = False
+        row.append(v if ok else 0.0)
+        present.append(ok)
+    return row, present
+
+
+def compute_mse_batch(rows: list, present: list) -> np.ndarray:
+    """compute_mse over rows from features_row, as one (B, n_features) array op.
+
+    The returned array is a view of a reused buffer when rows fit in a batch;
+    consume it before the next call.
+    """
+    b = len(rows)
+    if b <= MAX_BATCH:
+        X, P = _buf[:b], _present[:b]
+    else:
+        X = np.empty((b, len(KEYS)), dtype=np.float64)
+        P = np.empty((b, len(KEYS)), dtype=np.bool_)
+    X[...] = rows
+    P[...] = present
+    if mse_kernel is not None:
+        out = _out[:b] if b <= MAX_BATCH else np.empty(b, dtype=np.float64)
+        mse_kernel(X, P, SCALE, 2.0, out)
+        return out
+    # Overflow must not print a RuntimeWarning: the Java bridge reads stderr
+    # as part of the response stream
+    with np.errstate(over="ignore", invalid="ignore"):
+        V = X / SCALE
+        # float_power goes through libm pow like compute_mse's ** 2; V * V
+        # rounds differently in the last bit for some values
+        sq = np.float_power(V, 2)
+        # Finite values whose square overflows are left out, as in compute_mse;
+        # NaN and inf inputs are kept and carry into the mean
+        keep = P & ~(np.isinf(sq) & np.isfinite(V))
+        sq[~keep] = 0.0
+        # Column by column, so the sum is accumulated in compute_mse's order
+        acc = sq[:, 0].copy()
+        for j in range(1, sq.shape[1]):
+            acc += sq[:, j]
+    n = keep.sum(axis=1)
+    return acc / np.maximum(n, 1)
+
+
+def read_batches(fd: int):
+    """Yield lists of complete input lines (bytes), up to MAX_BATCH each.
+
+    os.read blocks until some input arrives and then returns everything
+    already waiting, so a burst of requests is scored together while a single
+    request is answered immediately.
+    """
+    pending = b""
+    while True:
+        chunk = os.read(fd, READ_SIZE)
+        if not chunk:
+            if pending.strip():
+                yield [pending]
+            return
+        *lines, pending = (pending + chunk).split(b"\n")
+        for i in range(0, len(lines), MAX_BATCH):
+            yield lines[i:i + MAX_BATCH]
 
 
 def main():
@@ -38,21 +132,45 @@ def main():
     parser.add_argument('--model', type=str, required=False, default='models/touch_ae_sklearn')
     _ = parser.parse_args()
 
-    for line in sys.stdin:
-        try:
+    # Responses stay on json.dumps: the Java bridge matches '"ok": true' with
+    # the space that orjson's compact output would drop.
+    stdout = sys.stdout.buffer
+    threshold = 1.0
+    for lines in read_batches(sys.stdin.fileno()):
+        # One response per non-blank line, in input order
+        results = [None] * len(lines)
+        rows, present, row_idx = [], [], []
+        for i, line in enumerate(lines):
             line = line.strip()
             if not line:
                 continue
-            data = json.loads(line)
-            mse = compute_mse(data)
-            threshold = 1.0
-            score = max(0.0, min(1.0, mse / threshold))
-            out = {"ok": True, "mse": mse, "threshold": threshold, "score": score}
-            sys.stdout.write(json.dumps(out) + "\n")
-            sys.stdout.flush()
-        except Exception as e:
-            sys.stdout.write(json.dumps({"ok": False, "error": str(e)}) + "\n")
-            sys.stdout.flush()
+            # A bad line gets its own error response and stays out of the batch
+            try:
+                data = _loads(line)
+                if not isinstance(data, dict):
+                    raise ValueError("Expected a JSON object of features")
+                row, mask = features_row(data)
+            except Exception as e:
+                results[i] = json.dumps({"ok": False, "error": str(e)})
+                continue
+            rows.append(row)
+            present.append(mask)
+            row_idx.append(i)
+        if rows:
+            try:
+                mse = compute_mse_batch(rows, present)
+                for i, m in zip(row_idx, mse.tolist()):
+                    # Same clamp as compute_mse's callers: a NaN mse scores 1.0
+                    score = max(0.0, min(1.0, m / threshold))
+                    results[i] = json.dumps({"ok": True, "mse": m, "threshold": threshold, "score": score})
+            except Exception as e:
+                # Keep serving: every line of the failed batch still gets an answer
+                for i in row_idx:
+                    results[i] = json.dumps({"ok": False, "error": str(e)})
+        out = [r for r in results if r is not None]
+        if out:
+            stdout.write(("\n".join(out) + "\n").encode())
+            stdout.flush()
 
 
 if __name__ == '__main__':
@@ -6,6 +6,8 @@ gesture,duration_ms,total_distance,avg_velocity,peak_velocity,avg_pressure,peak_
 
 Examples:
 	python ml/touch/train_autoencoder_tf.py --csv data/normal_touch_features_*.csv --epochs 3 --out models/touch_ae_tflite_tf
+	# --fuse_scaler --fp32 exports raw features -> per-row MSE (no scaler.json needed at inference;
+	# not usable by the Android TouchAETFLiteScorer, which expects a reconstruction)
 	# Or simply run without --csv to use the default pattern data/normal_touch_features_*.csv
 """
 import argparse
@@ -20,31 +22,67 @@ import pandas as pd
 import tensorflow as tf
 # Support both "python -m ml.touch.train_autoencoder_tf" and direct file execution
 try:
-	from .gesture_map import get_default_map  # type: ignore
+	from .gesture_map import get_default_map, known_mask, encode_categorical  # type: ignore
 except Exception:  # pragma: no cover - runtime fallback for direct script exec
 	import os as _os, sys as _sys
 	_sys.path.append(_os.path.abspath(_os.path.join(_os.path.dirname(__file__), "..", "..")))
-	from ml.touch.gesture_map import get_default_map  # type: ignore
+	from ml.touch.gesture_map import get_default_map, known_mask, encode_categorical  # type: ignore
 import keras as keras
 
-def _load_one_csv(path: str) -> np.ndarray:
-	# Read rows; keep only those whose first col matches a known gesture
-	df = pd.read_csv(path, header=None, skip_blank_lines=True)
-	gmap = get_default_map()
-	df = df[df[0].astype(str).isin(gmap.keys())].copy()
-	if df.empty:
-		return np.zeros((0, 0), dtype=np.float32)
-	df.columns = [
-		"gesture", "duration_ms", "total_distance", "avg_velocity", "peak_velocity",
-		"avg_pressure", "peak_pressure", "path_deviation", "direction_changes", "jitter"
-	]
-	df["gesture_num"] = df["gesture"].map(gmap).astype(float)
-	feats = [
-		"gesture_num", "duration_ms", "total_distance", "avg_velocity", "peak_velocity",
-		"avg_pressure", "peak_pressure", "path_deviation", "direction_changes", "jitter"
-	]
-	X = df[feats].astype(np.float32).to_numpy()
-	return X
+NAMES = [
+	"gesture", "duration_ms", "total_distance", "avg_velocity", "peak_velocity",
+	"avg_pressure", "peak_pressure", "path_deviation", "direction_changes", "jitter"
+]
+DTYPES = {n: np.float32 for n in NAMES[1:]}
+GESTURE_DTYPES = {"gesture": "category", **DTYPES}
+_GKEYS = frozenset(get_default_map())
+
+
+CHUNK_ROWS = 1 << 16
+
+
+def _read_chunks_untyped(path: str, gmap):
+	# Tolerates stray non-numeric rows (e.g. a header line) by filtering first
+	for df in pd.read_csv(path, header=None, dtype={0: "category"}, skip_blank_lines=True, chunksize=CHUNK_ROWS):
+		df = df[known_mask(df[0], _GKEYS)].copy()
+		df.columns = NAMES
+		df["gesture"] = encode_categorical(df["gesture"], gmap)
+		yield df
+
+
+def _read_chunks(path: str, gmap):
+	# Gestures are parsed as a category and encoded per category (unknown labels become NaN)
+	for df in pd.read_csv(
+		path, header=None, names=NAMES, dtype=GESTURE_DTYPES, skip_blank_lines=True, engine="c",
+		chunksize=CHUNK_ROWS,
+	):
+		df["gesture"] = encode_categorical(df["gesture"], gmap)
+		yield df
+
+
+def _count_rows(path: str, keys) -> int:
+	# Rows whose first col matches a known gesture, without parsing the features
+	n = 0
+	for chunk in pd.read_csv(path, header=None, usecols=[0], dtype={0: "category"}, skip_blank_lines=True, chunksize=CHUNK_ROWS):
+		n += int(known_mask(chunk[0], keys).sum())
+	return n
+
+
+def _fill_from_csv(path: str, gmap, out: np.ndarray, offset: int) -> int:
+	# Writes the valid rows of one CSV into out[offset:], chunk by chunk.
+	# Returns the new offset.
+	start = offset
+	try:
+		for df in _read_chunks(path, gmap):
+			df = df.dropna(subset=["gesture"])
+			out[offset:offset + len(df)] = df[NAMES].to_numpy(dtype=np.float32)
+			offset += len(df)
+	except ValueError:
+		offset = start
+		for df in _read_chunks_untyped(path, gmap):
+			out[offset:offset + len(df)] = df[NAMES].to_numpy(dtype=np.float32)
+			offset += len(df)
+	return offset
 
 
 def load_csvs(patterns: List[str]) -> np.ndarray:
@@ -54,23 +92,60 @@ def load_csvs(patterns: List[str]) -> np.ndarray:
 	files = sorted(set(files))
 	if not files:
 		raise FileNotFoundError("No CSV files matched: " + ", ".join(patterns))
-	arrays = []
-	for f in files:
-		X = _load_one_csv(f)
-		if X.size > 0:
-			arrays.append(X)
-	if not arrays:
+	gmap = get_default_map()
+	# Two passes: count valid rows, then fill one preallocated array so peak
+	# memory stays at the dataset size plus a single chunk.
+	counts = [_count_rows(f, _GKEYS) for f in files]
+	total = sum(counts)
+	if total == 0:
 		raise ValueError("No valid rows found in the matched CSV files.")
-	Xall = np.vstack(arrays)
-	return Xall
+	Xall = np.empty((total, len(NAMES)), dtype=np.float32)
+	offset = 0
+	for f, c in zip(files, counts):
+		if c:
+			offset = _fill_from_csv(f, gmap, Xall, offset)
+	return Xall[:offset]
 
-def build_model(n):
+
+def build_model(n, mean=None, std=None):
 	inp = keras.Input(shape=(n,), name="in")
-	x = keras.layers.Dense(max(8, n // 2), activation="relu")(inp)
+	x = inp
+	if mean is not None:
+		# Standardization inside the graph: the model takes raw features
+		x = keras.layers.Normalization(axis=-1, mean=mean, variance=std ** 2, name="norm")(x)
+	z = x
+	x = keras.layers.Dense(max(8, n // 2), activation="relu")(x)
 	x = keras.layers.Dense(n, activation=None, name="recon")(x)
 	model = keras.Model(inp, x)
 	model.compile(optimizer=keras.optimizers.Adam(1e-3), loss="mse")
-	return model
+	if mean is None:
+		return model, None
+	# Export head: per-row MSE against the standardized input, shape [N, 1]
+	err = keras.layers.Lambda(
+		lambda t: tf.reduce_mean(tf.square(t[0] - t[1]), axis=-1, keepdims=True), name="mse"
+	)([z, x])
+	return model, keras.Model(inp, err)
+
+
+def _representative_dataset(Xs, max_samples=100):
+	# Calibration samples for int8 quantization, spread over the training set
+	idx = np.linspace(0, len(Xs) - 1, min(max_samples, len(Xs))).astype(int)
+
+	def gen():
+		for i in idx:
+			yield [Xs[i:i + 1].astype(np.float32)]
+	return gen
+
+
+def _tflite_predict(tfl: bytes, Xs: np.ndarray) -> np.ndarray:
+	itp = tf.lite.Interpreter(model_content=tfl)
+	inp = itp.get_input_details()[0]
+	out = itp.get_output_details()[0]
+	itp.resize_tensor_input(inp["index"], list(Xs.shape))
+	itp.allocate_tensors()
+	itp.set_tensor(inp["index"], Xs.astype(np.float32))
+	itp.invoke()
+	return itp.get_tensor(out["index"])
 
 
 def main(argv=None):
@@ -86,7 +161,17 @@ def main(argv=None):
 	ap.add_argument("--batch", type=int, default=64)
 	ap.add_argument("--out", default="models/touch_ae_tflite_tf")
 	ap.add_argument("--threshold_k", type=float, default=3.0, help="std dev multiplier for threshold")
+	ap.add_argument("--fp32", action="store_true", help="export a float32 model instead of int8")
+	ap.add_argument(
+		"--fuse_scaler",
+		action="store_true",
+		help="bake standardization into the model and export a raw-features -> MSE graph (requires --fp32)",
+	)
 	args = ap.parse_args(argv)
+	if args.fuse_scaler and not args.fp32:
+		# int8 would quantize the raw input and the MSE output to ranges seen on
+		# normal data, saturating exactly the large errors anomalies produce
+		ap.error("--fuse_scaler requires --fp32")
 
 	os.makedirs(args.out, exist_ok=True)
 
@@ -102,12 +187,49 @@ def main(argv=None):
 	std[std == 0] = 1.0
 	Xs = (X - mean) / std
 
-	model = build_model(n)
-	model.fit(Xs, Xs, epochs=args.epochs, batch_size=args.batch, verbose=2)
+	if args.fuse_scaler:
+		# Trains on raw X against the standardized target; the exported graph
+		# returns the MSE directly, so clients need no scaler.json
+		model, export = build_model(n, mean, std)
+		Xin = X
+	else:
+		model, _ = build_model(n)
+		export = model
+		Xin = Xs
+	# cache() before shuffle() so each epoch still gets a fresh order
+	ds = (
+		tf.data.Dataset.from_tensor_slices((Xin, Xs))
+		.cache()
+		.shuffle(8192)
+		.batch(args.batch)
+		.prefetch(tf.data.AUTOTUNE)
+	)
+	model.fit(ds, epochs=args.epochs, verbose=2)
 
-	# Reconstruction and threshold
-	pred = model.predict(Xs, batch_size=args.batch, verbose=0)
-	mse = ((Xs - pred) ** 2).mean(axis=1)
+	# Export TFLite directly
+	converter = tf.lite.TFLiteConverter.from_keras_model(export)
+	if not args.fp32:
+		# int8 weights and activations. Input/output stay float32 so the Android
+		# scorer and infer_autoencoder.py feed the model unchanged.
+		converter.optimizations = [tf.lite.Optimize.DEFAULT]
+		converter.representative_dataset = _representative_dataset(Xin)
+		converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+	tfl = converter.convert()
+	tfl_path = os.path.join(args.out, "touch_ae.tflite")
+	with open(tfl_path, "wb") as f:
+		f.write(tfl)
+
+	# Reconstruction and threshold, from the exported model since quantization
+	# shifts the reconstruction error
+	if args.fp32:
+		ds_eval = tf.data.Dataset.from_tensor_slices(Xin).batch(args.batch).prefetch(tf.data.AUTOTUNE)
+		pred = export.predict(ds_eval, verbose=0)
+	else:
+		pred = _tflite_predict(tfl, Xin)
+	if args.fuse_scaler:
+		mse = pred[:, 0]
+	else:
+		mse = ((Xs - pred) ** 2).mean(axis=1)
 	thr = float(np.mean(mse) + args.threshold_k * np.std(mse))
 
 	# Write scaler and threshold
@@ -116,15 +238,9 @@ def main(argv=None):
 	with open(os.path.join(args.out, "threshold.json"), "w") as f:
 		json.dump({"threshold": thr}, f)
 
-	# Export TFLite directly
-	converter = tf.lite.TFLiteConverter.from_keras_model(model)
-	tfl = converter.convert()
-	tfl_path = os.path.join(args.out, "touch_ae.tflite")
-	with open(tfl_path, "wb") as f:
-		f.write(tfl)
-
 	with open(os.path.join(args.out, "report.txt"), "w") as f:
-		f.write(f"n={n}\nthreshold={thr}\ntrain_samples={len(X)}\n")
+		f.write(f"n={n}\nthreshold={thr}\ntrain_samples={len(X)}\nquantization={'fp32' if args.fp32 else 'int8'}\n"
+			f"fused_scaler={int(args.fuse_scaler)}\n")
 
 	print(f"Wrote: {tfl_path}")
 